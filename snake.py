@@ -6,12 +6,25 @@ Steuerung:
   q                – Beenden
 """
 
+import functools
+import os
+import select
 import sys
 import time
+from collections import deque
 from blessed import Terminal
 
 term = Terminal()
 
+# Escape‑Sequenzen einmalig auflösen statt pro Zelle
+RESET = term.normal
+EMPTY_BG = term.on_black
+BLOCK = "█"
+
+# DEC‑Modus 2026: Terminal zeigt den Frame erst nach ESU an (kein Tearing)
+BSU = "\x1b[?2026h"   # Begin Synchronized Update
+ESU = "\x1b[?2026l"   # End Synchronized Update
+
 # ----------------------------------------------------------------------
 # Spielfeld‑Größe (ganzer Terminal‑Bereich, letzte Zeile für Status)
 # ----------------------------------------------------------------------
@@ -29,6 +42,45 @@ DIRS = {
 }
 OPPOSITE = {"LEFT": "RIGHT", "RIGHT": "LEFT", "UP": "DOWN", "DOWN": "UP"}
 
+# ----------------------------------------------------------------------
+# Tastatur – direkt von stdin statt über term.inkey()
+# ----------------------------------------------------------------------
+# read_key und write_out gibt es bewusst auch in tetris.py: jedes Spiel
+# bleibt eine einzelne Datei, startbar mit `python3 snake.py`.
+# Pfeiltasten (normaler und „application cursor“‑Modus)
+KEY_SEQUENCES = {
+    b"\x1b[A": "KEY_UP",    b"\x1bOA": "KEY_UP",
+    b"\x1b[B": "KEY_DOWN",  b"\x1bOB": "KEY_DOWN",
+    b"\x1b[C": "KEY_RIGHT", b"\x1bOC": "KEY_RIGHT",
+    b"\x1b[D": "KEY_LEFT",  b"\x1bOD": "KEY_LEFT",
+}
+pending_keys: list[str] = []   # bereits gelesene, noch nicht verarbeitete Tasten
+
+def read_key(timeout: float | None) -> str:
+    """
+    Wartet höchstens `timeout` Sekunden (None = unbegrenzt) auf eine Taste.
+    Liefert "KEY_UP" usw. für Pfeiltasten, sonst das Zeichen, "" bei Timeout
+    und "q" bei EOF auf stdin.
+    Setzt voraus, dass das Terminal im cbreak‑Modus ist.
+    """
+    if not pending_keys:
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        if not ready:
+            return ""
+        data = os.read(sys.stdin.fileno(), 32)
+        if not data:
+            return "q"   # EOF (z. B. Terminal geschlossen) – wie Beenden behandeln
+        i = 0
+        while i < len(data):
+            name = KEY_SEQUENCES.get(data[i:i + 3])
+            if name:
+                pending_keys.append(name)
+                i += 3
+            else:
+                pending_keys.append(chr(data[i]))
+                i += 1
+    return pending_keys.pop(0)
+
 # ----------------------------------------------------------------------
 # Hilfsfunktionen
 # ----------------------------------------------------------------------
@@ -39,8 +91,12 @@ def init_snake() -> list[tuple[int, int]]:
     # Startlänge 3, Richtung rechts
     return [(cx, cy), (cx - 1, cy), (cx - 2, cy)]
 
+@functools.lru_cache(maxsize=512)
 def hsv_to_256color(h: float, s: float = 1.0, v: float = 1.0) -> str:
-    """Konvertiert HSV (Hue 0‑360) in einen 256‑Palette‑Index und gibt das Blessed‑Farb‑Objekt."""
+    """
+    Konvertiert HSV (Hue 0‑360) in einen 256‑Palette‑Index und gibt das Blessed‑Farb‑Objekt.
+    Ergebnisse werden gecacht; Aufrufer übergeben ganze Grad, also höchstens 361 Schlüssel.
+    """
     c = v * s
     h_mod = (h / 60) % 6
     x = c * (1 - abs(h_mod % 2 - 1))
@@ -70,82 +126,138 @@ def hsv_to_256color(h: float, s: float = 1.0, v: float = 1.0) -> str:
     idx = 16 + 36 * r6 + 6 * g6 + b6
     return term.color(idx)
 
-def colour_for_segment(index: int, length: int) -> str:
+# Länge → fertige Zellen (Farbe, Zeichen) je Segment, nur für die aktuelle
+# Länge. Die Schlange wächst nur, ältere Längen werden nie wieder gelesen.
+RAINBOW_CACHE: dict[int, list[tuple[str, str]]] = {}
+
+def rainbow(length: int) -> list[tuple[str, str]]:
     """
-    Regenbogen‑Verlauf von Rot (Hue 0°) bis Violett (Hue 300°).
+    Regenbogen‑Verlauf von Rot (Hue 0°) bis Violett (Hue 300°) für alle
+    Segmente einer Schlange der Länge `length`.
     Der Kopf ist immer helles Rot, der Schwanz fast Violett.
     """
-    if length == 1:
-        hue = 0
-    else:
-        hue = (index / (length - 1)) * 300   # linear von 0° → 300°
-    return hsv_to_256color(hue)
-
-def draw(snake: list[tuple[int, int]], direction: str, score: int) -> None:
-    """Rendert das komplette Bild ohne das Terminal zu löschen."""
-    # Cursor nach links oben setzen
-    print(term.home, end="")
-
-    # Mapping Position → Index, damit wir die richtige Farbe erhalten können
-    pos_to_idx = {pos: i for i, pos in enumerate(snake)}
-    snake_len = len(snake)
-
-    for y in range(BOARD_HEIGHT):
-        line = ""
-        for x in range(BOARD_WIDTH):
-            idx = pos_to_idx.get((x, y))
-            if idx is not None:
-                colour = colour_for_segment(idx, snake_len)
-                line += colour + "█" + term.normal
-            else:
-                # Leere Zellen – ein schwarzer Hintergrund‑Space
-                line += term.on_black + " " + term.normal
-        # Zeile ausgeben (inkl. Zeilenumbruch)
-        print(line)
+    cells = RAINBOW_CACHE.get(length)
+    if cells is None:
+        # Alle Hues in einem Durchgang, ganzzahlig auf volle Grad gerundet
+        span = max(length - 1, 1)
+        hues = [(i * 300 + span // 2) // span for i in range(length)]
+        # Benachbarte Hues landen oft auf derselben Palettenfarbe – diese
+        # Segmente teilen sich dann ein und dasselbe Zellen‑Tupel.
+        by_colour: dict[str, tuple[str, str]] = {}
+        cells = [
+            by_colour.setdefault(colour, (RESET + colour, BLOCK))
+            for colour in map(hsv_to_256color, hues)
+        ]
+        RAINBOW_CACHE.clear()
+        RAINBOW_CACHE[length] = cells
+    return cells
+
+# ----------------------------------------------------------------------
+# Frame‑Puffer für diff‑basiertes Rendern
+# ----------------------------------------------------------------------
+# (Farbe, Zeichen) je Zelle, so wie sie zuletzt ausgegeben wurde
+EMPTY = (EMPTY_BG, " ")
+prev_frame: list[list[tuple[str, str]]] = [
+    [EMPTY] * BOARD_WIDTH for _ in range(BOARD_HEIGHT)
+]
+# Zellen, die im letzten Frame zur Schlange gehörten
+prev_snake: set[tuple[int, int]] = set()
+
+def write_out(text: str) -> None:
+    """
+    Schreibt `text` direkt auf fd 1 – ohne TextIOWrapper, kein Flush nötig.
+    Vorher gepufferte print()-Ausgaben müssen bereits geflusht sein.
+    """
+    data = memoryview(text.encode("utf-8"))
+    while data:
+        data = data[os.write(1, data):]
+
+def draw_background() -> None:
+    """Malt das leere Spielfeld einmalig – danach zeichnet `draw` nur noch Änderungen."""
+    row = EMPTY_BG + " " * BOARD_WIDTH + RESET
+    write_out(term.home + "".join(term.move_xy(0, y) + row for y in range(BOARD_HEIGHT)))
+    for row_cells in prev_frame:
+        row_cells[:] = [EMPTY] * BOARD_WIDTH
+    prev_snake.clear()
+
+def draw(snake: deque[tuple[int, int]], direction: str, score: int) -> None:
+    """Rendert nur die Zellen, die sich seit dem letzten Frame geändert haben."""
+    cells = rainbow(len(snake))
+
+    # Geänderte Zellen sammeln: erst die Schlange selbst …
+    changed = []
+    for cell, (x, y) in zip(cells, snake):
+        if prev_frame[y][x] != cell:
+            changed.append((x, y, cell))
+    # … dann die Zellen, die die Schlange verlassen hat (schwarzer Hintergrund)
+    for x, y in prev_snake.difference(snake):
+        changed.append((x, y, EMPTY))
+    prev_snake.clear()
+    prev_snake.update(snake)
+
+    buf = [BSU]
+    current_sgr = None   # zuletzt ausgegebene Farbe – nur bei Wechsel neu setzen
+    for x, y, cell in changed:
+        prev_frame[y][x] = cell
+        sgr, glyph = cell
+        if sgr != current_sgr:
+            buf.append(term.move_xy(x, y) + sgr + glyph)
+            current_sgr = sgr
+        else:
+            buf.append(term.move_xy(x, y) + glyph)
+    buf.append(RESET)
 
     # Status‑Zeile (unterste Zeile) – ohne nachfolgenden Zeilenumbruch,
     # damit das Terminal nicht scrollt.
     status = f"Score: {score}   Dir: {direction}   q: quit"
-    print(term.move_xy(0, BOARD_HEIGHT) + term.clear_eol + status, end="")
-
-    # Sicherstellen, dass alles sofort auf dem Terminal erscheint
-    sys.stdout.flush()
+    buf.append(term.move_xy(0, BOARD_HEIGHT) + term.clear_eol + status)
+    buf.append(ESU)
+    write_out("".join(buf))
 
 # ----------------------------------------------------------------------
 # Haupt‑Game‑Loop
 # ----------------------------------------------------------------------
 def main() -> None:
-    snake = init_snake()
+    # deque: Kopf vorne einfügen und Schwanz entfernen in O(1)
+    snake = deque(init_snake())
+    occupied = set(snake)           # belegte Zellen für die Selbst‑Kollision
     direction = "RIGHT"
     move_counter = 0
     score = 0
-    speed = 0.12                    # Sekunden pro automatischen Schritt
+    speed_ns = 120_000_000          # Nanosekunden pro automatischen Schritt
 
-    last_tick = time.time()
+    next_tick = time.monotonic_ns() + speed_ns
 
     with term.fullscreen(), term.cbreak(), term.hidden_cursor():
+        draw_background()
+        draw(snake, direction, score)
         while True:
             # ------------------- Eingabe -------------------
-            key = term.inkey(timeout=0.01)
-            if key.name in ("KEY_LEFT", "KEY_A"):
+            # Genau bis zum nächsten Schritt warten – kein Busy‑Polling
+            remaining_ns = max(0, next_tick - time.monotonic_ns())
+            key = read_key(remaining_ns / 1e9)
+            if key in ("KEY_LEFT", "a"):
                 if direction != "RIGHT":
                     direction = "LEFT"
-            elif key.name in ("KEY_RIGHT", "KEY_D"):
+            elif key in ("KEY_RIGHT", "d"):
                 if direction != "LEFT":
                     direction = "RIGHT"
-            elif key.name in ("KEY_UP", "KEY_W"):
+            elif key in ("KEY_UP", "w"):
                 if direction != "DOWN":
                     direction = "UP"
-            elif key.name in ("KEY_DOWN", "KEY_S"):
+            elif key in ("KEY_DOWN", "s"):
                 if direction != "UP":
                     direction = "DOWN"
             elif key == "q":
                 break
 
             # ------------------- Automatischer Schritt -------------------
-            now = time.time()
-            if now - last_tick >= speed:
-                last_tick = now
+            now = time.monotonic_ns()
+            if now >= next_tick:
+                # Fester Takt; nach einer Pause (z. B. Ctrl‑Z) nicht nachholen
+                next_tick += speed_ns
+                if next_tick <= now:
+                    next_tick = now + speed_ns
                 move_counter += 1
 
                 dx, dy = DIRS[direction]
@@ -154,24 +266,25 @@ def main() -> None:
 
                 # Wand‑Kollision
                 if not (0 <= new_head[0] < BOARD_WIDTH and 0 <= new_head[1] < BOARD_HEIGHT):
-                    draw(snake, direction, score)
-                    print(term.move_xy(0, BOARD_HEIGHT + 1) + term.bold_red("Game Over – Wand getroffen.") + term.normal)
-                    term.inkey()
+                    # Das letzte Bild steht bereits – kein erneutes Zeichnen nötig
+                    print(term.move_xy(0, BOARD_HEIGHT + 1) + term.bold_red("Game Over – Wand getroffen.") + term.normal, flush=True)
+                    read_key(None)
                     break
 
                 # Selbst‑Kollision
-                if new_head in snake:
-                    draw(snake, direction, score)
-                    print(term.move_xy(0, BOARD_HEIGHT + 1) + term.bold_red("Game Over – Selbstkollision.") + term.normal)
-                    term.inkey()
+                if new_head in occupied:
+                    # Das letzte Bild steht bereits – kein erneutes Zeichnen nötig
+                    print(term.move_xy(0, BOARD_HEIGHT + 1) + term.bold_red("Game Over – Selbstkollision.") + term.normal, flush=True)
+                    read_key(None)
                     break
 
                 # Neuen Kopf einfügen
-                snake.insert(0, new_head)
+                snake.appendleft(new_head)
+                occupied.add(new_head)
 
                 # Wachstum: jede zweite Bewegung wird kein Schwanz entfernt → Schlange wird länger
                 if move_counter % 2 == 0:
-                    snake.pop()          # normaler Schritt
+                    occupied.discard(snake.pop())   # normaler Schritt
                 else:
                     score += 1           # Wachstumsschritt
 
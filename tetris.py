@@ -5,7 +5,11 @@ Run with: python3 tetris.py
 Requires: pip install blessed
 """
 
+import functools
+import os
 import random
+import select
+import sys
 import time
 from blessed import Terminal
 
@@ -15,6 +19,21 @@ from blessed import Terminal
 BOARD_WIDTH = 10
 BOARD_HEIGHT = 20
 
+# DEC private mode 2026: the terminal holds the frame until ESU, so a
+# repaint is shown atomically instead of row by row.
+BSU = "\x1b[?2026h"   # Begin Synchronized Update
+ESU = "\x1b[?2026l"   # End Synchronized Update
+
+FRAME_INTERVAL_NS = 1_000_000_000 // 60  # redraw at most 60 times per second
+
+# Arrow keys as sent in normal and application cursor mode
+KEY_SEQUENCES = {
+    b"\x1b[A": "KEY_UP",    b"\x1bOA": "KEY_UP",
+    b"\x1b[B": "KEY_DOWN",  b"\x1bOB": "KEY_DOWN",
+    b"\x1b[C": "KEY_RIGHT", b"\x1bOC": "KEY_RIGHT",
+    b"\x1b[D": "KEY_LEFT",  b"\x1bOD": "KEY_LEFT",
+}
+
 # Tetromino definitions – each piece has four rotation states.
 # Each state is a list of (x, y) offsets within a 4×4 grid.
 TETROMINOS = {
@@ -73,70 +92,217 @@ PIECE_COLORS = {
     "L": 208, # orange (bright)
 }
 
+PIECE_NAMES = tuple(TETROMINOS)
+
+# Board cells store a small integer per piece; 0 = empty.
+PIECE_ID = {name: i for i, name in enumerate(PIECE_COLORS, start=1)}
+
+# Collision uses bitmasks: bit x of a row mask is set iff column x is filled.
+FULL_ROW = (1 << BOARD_WIDTH) - 1
+
+# Smallest x offset at which a piece can still have a block on the board
+MIN_OX = -3
+
+
+def shape_to_bits(shape, ox):
+    """Return ((dy, row_mask), ...) for shape shifted by ox, or None if it sticks out sideways."""
+    if not all(0 <= x + ox < BOARD_WIDTH for x, _ in shape):
+        return None
+    rows = {}
+    for x, y in shape:
+        rows[y] = rows.get(y, 0) | 1 << (x + ox)
+    return tuple(sorted(rows.items()))
+
+
+# Every rotation pre-shifted to every column: TETROMINOS_BITS[piece][rot][ox - MIN_OX].
+# can_place then needs no shifting or horizontal bounds logic at runtime.
+TETROMINOS_BITS = {
+    name: [
+        [shape_to_bits(shape, ox) for ox in range(MIN_OX, BOARD_WIDTH)]
+        for shape in rotations
+    ]
+    for name, rotations in TETROMINOS.items()
+}
+
 
 # ----------------------------------------------------------------------
 # Helper functions
 # ----------------------------------------------------------------------
 def create_board():
-    """Return a fresh empty board (list of rows)."""
-    return [[None for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
+    """Return a fresh empty board (list of bytearray rows, 0 = empty)."""
+    return [bytearray(BOARD_WIDTH) for _ in range(BOARD_HEIGHT)]
 
 
-def can_place(board, shape, pos):
-    """True iff shape can sit at pos without colliding or leaving the board."""
+def can_place(row_bits, shape_bits, pos):
+    """True iff the piece can sit at pos without colliding or leaving the board."""
     ox, oy = pos
-    for x, y in shape:
-        ax, ay = x + ox, y + oy
-        if not (0 <= ax < BOARD_WIDTH and 0 <= ay < BOARD_HEIGHT):
-            return False
-        if board[ay][ax] is not None:
+    if not MIN_OX <= ox < BOARD_WIDTH:
+        return False
+    rows = shape_bits[ox - MIN_OX]
+    if rows is None:
+        return False
+    # rows are sorted by dy, so the first and last give the vertical extent
+    if oy + rows[0][0] < 0 or oy + rows[-1][0] >= BOARD_HEIGHT:
+        return False
+    for dy, mask in rows:
+        if row_bits[oy + dy] & mask:
             return False
     return True
 
 
-def lock_piece(board, shape, pos, piece):
-    """Write the piece into the board permanently."""
+def column_bits(row_bits):
+    """Return per-column occupancy masks: bit y of entry x is set iff (x, y) is filled."""
+    cols = [0] * BOARD_WIDTH
+    for y, bits in enumerate(row_bits):
+        for x in range(BOARD_WIDTH):
+            if bits >> x & 1:
+                cols[x] |= 1 << y
+    return cols
+
+
+def drop_distance(col_bits, shape, pos):
+    """Return how many rows the piece can fall straight down from pos."""
     ox, oy = pos
+    distance = BOARD_HEIGHT
     for x, y in shape:
-        board[y + oy][x + ox] = piece
+        ay = y + oy
+        below = col_bits[x + ox] >> (ay + 1)
+        if below:
+            # index of the lowest set bit = free rows before the first block
+            free = (below & -below).bit_length() - 1
+        else:
+            free = BOARD_HEIGHT - ay - 1
+        distance = min(distance, free)
+    return distance
 
 
-def clear_full_lines(board):
-    """Remove completed rows, return (new_board, cleared_count)."""
-    new_board = [row for row in board if any(cell is None for cell in row)]
-    cleared = BOARD_HEIGHT - len(new_board)
-    for _ in range(cleared):
-        new_board.insert(0, [None] * BOARD_WIDTH)
-    return new_board, cleared
+def lock_piece(board, row_bits, col_bits, shape, pos, piece):
+    """Write the piece into the board permanently and clear the rows it completed.
 
+    Only the rows the piece touched can have become full, so just those
+    are checked. Cleared rows are removed in place and replaced by empty
+    rows at the top. Returns the number of cleared rows.
+    """
+    ox, oy = pos
+    piece_id = PIECE_ID[piece]
+    touched = set()
+    for x, y in shape:
+        board[y + oy][x + ox] = piece_id
+        row_bits[y + oy] |= 1 << (x + ox)
+        col_bits[x + ox] |= 1 << (y + oy)
+        touched.add(y + oy)
 
-def draw_board(term, board, shape, pos, piece):
-    """Render the board + the falling piece."""
-    # Clear screen once per frame
-    print(term.home + term.clear)
+    # Ascending order: removing row y and inserting at the top keeps
+    # the indices of all rows below y unchanged.
+    full = sorted(y for y in touched if row_bits[y] == FULL_ROW)
+    for y in full:
+        del board[y]
+        board.insert(0, bytearray(BOARD_WIDTH))
+        del row_bits[y]
+        row_bits.insert(0, 0)
+    if full:
+        col_bits[:] = column_bits(row_bits)
+    return len(full)
+
+
+@functools.cache
+def cell_strings(term):
+    """Return a lookup table: cell id → rendered cell, escape sequences resolved once.
+
+    Index 0 is the empty cell, PIECE_ID[name] the cell of that piece.
+    """
+    cells = [term.on_black + "  " + term.normal] * (len(PIECE_COLORS) + 1)
+    for name, color in PIECE_COLORS.items():
+        cells[PIECE_ID[name]] = term.on_color(color) + "  " + term.normal
+    return cells
+
+
+def create_frame():
+    """Return a frame buffer that matches no board, so the first draw paints everything."""
+    return [bytearray(b"\xff" * BOARD_WIDTH) for _ in range(BOARD_HEIGHT)]
+
+
+def draw_board(term, frame, board, shape, pos, piece, score, level):
+    """Render the board + the falling piece as a single write.
+
+    frame holds the cell ids currently on screen; only cells that differ
+    from it are written, and it is updated to the new frame.
+    """
+    cells = cell_strings(term)
 
     left = 2   # left margin (in characters)
     top = 1    # top margin (in lines)
 
-    for y in range(BOARD_HEIGHT):
-        line = ""
+    render = [bytearray(row) for row in board]
+    # Overlay the active piece – only its four cells need touching
+    if shape:
+        ox, oy = pos
+        piece_id = PIECE_ID[piece]
+        for x, y in shape:
+            render[y + oy][x + ox] = piece_id
+
+    buf = [BSU]
+    for y, (new, old) in enumerate(zip(render, frame)):
+        if new == old:
+            continue
         for x in range(BOARD_WIDTH):
-            cell = board[y][x]
-            # Overlay the active piece if it occupies this cell
-            if shape and (x - pos[0], y - pos[1]) in shape:
-                cell = piece
-            if cell is None:
-                line += term.on_black + "  " + term.normal
-            else:
-                color = PIECE_COLORS[cell]
-                line += term.on_color(color) + "  " + term.normal
-        print(term.move_xy(left, top + y) + line)
+            cell = new[x]
+            if cell != old[x]:
+                buf.append(term.move_xy(left + 2 * x, top + y) + cells[cell])
+        old[:] = new
 
-    # Footer with controls
-    print(
+    # Footer with controls and score
+    buf.append(
         term.move_xy(left, top + BOARD_HEIGHT + 1)
         + term.bold("Controls: ← → ↓ ↑ rotate, space drop, q quit")
     )
+    buf.append(
+        term.move_xy(left, top + BOARD_HEIGHT + 2)
+        + term.bold(f"Score: {score}  Level: {level}")
+        + term.clear_eol
+    )
+    buf.append(ESU)
+    write_out("".join(buf))
+
+
+def write_out(text):
+    """Write text straight to fd 1, bypassing sys.stdout's encoder and buffer.
+
+    Anything printed before must already be flushed, or it would appear
+    after this output.
+    """
+    data = memoryview(text.encode("utf-8"))
+    while data:
+        data = data[os.write(1, data):]
+
+
+# read_key and write_out are also in snake.py on purpose: each game stays
+# a single file that runs with plain `python3 <game>.py`.
+def read_key(timeout, pending_keys):
+    """Wait up to timeout seconds (None = forever) for a key on stdin.
+
+    Returns "KEY_UP" etc. for arrow keys, the character otherwise, ""
+    on timeout and "q" on EOF. Expects the terminal to be in cbreak mode.
+    Keys that arrive together are queued in pending_keys (owned by the
+    caller) and returned one per call.
+    """
+    if not pending_keys:
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        if not ready:
+            return ""
+        data = os.read(sys.stdin.fileno(), 32)
+        if not data:
+            return "q"  # EOF (e.g. terminal hangup): treat like quitting
+        i = 0
+        while i < len(data):
+            name = KEY_SEQUENCES.get(data[i:i + 3])
+            if name:
+                pending_keys.append(name)
+                i += 3
+            else:
+                pending_keys.append(chr(data[i]))
+                i += 1
+    return pending_keys.pop(0)
 
 
 # ----------------------------------------------------------------------
@@ -145,126 +311,137 @@ def draw_board(term, board, shape, pos, piece):
 def main():
     term = Terminal()
     board = create_board()
+    row_bits = [0] * BOARD_HEIGHT
+    col_bits = [0] * BOARD_WIDTH
+    frame = create_frame()
+    pending_keys = []  # keys already read from stdin but not yet handled
     score = 0
     level = 1
     total_cleared = 0
-    fall_interval = 0.5  # seconds per automatic drop
+    fall_interval_ns = 500_000_000  # nanoseconds per automatic drop
 
     # Current piece state
     piece = None
     rotation = 0
     shape = None
+    shape_bits = None
     pos = (0, 0)
+    bag = []  # 7-bag randomizer: every piece once per shuffled round
 
     def spawn():
-        """Pick a new tetromino and place it at the top."""
-        nonlocal piece, rotation, shape, pos
-        piece = random.choice(list(TETROMINOS.keys()))
+        """Take the next tetromino from the bag and place it at the top."""
+        nonlocal piece, rotation, shape, shape_bits, pos
+        if not bag:
+            bag.extend(PIECE_NAMES)
+            random.shuffle(bag)
+        piece = bag.pop()
         rotation = 0
         shape = TETROMINOS[piece][rotation]
+        shape_bits = TETROMINOS_BITS[piece][rotation]
         # Center horizontally; the 4×4 grid is anchored at (0,0)
         pos = (BOARD_WIDTH // 2 - 2, 0)
-        return can_place(board, shape, pos)
+        return can_place(row_bits, shape_bits, pos)
+
+    def settle():
+        """Lock the piece, clear its full lines, score them and spawn the next one."""
+        nonlocal score, level, total_cleared, fall_interval_ns
+        cleared = lock_piece(board, row_bits, col_bits, shape, pos, piece)
+        if cleared:
+            total_cleared += cleared
+            score += (cleared ** 2) * 100
+            level = total_cleared // 10 + 1
+            fall_interval_ns = max(100_000_000, 500_000_000 - (level - 1) * 40_000_000)
+        return spawn()
+
+    def game_over():
+        """Show the final board and score, then wait for a key."""
+        draw_board(term, frame, board, None, None, None, score, level)
+        # Below the score line (top margin 1 + board + controls + score)
+        print(
+            term.move_xy(2, BOARD_HEIGHT + 4)
+            + term.bold_red(f"Game Over! Final Score: {score}"),
+            flush=True,
+        )
+        read_key(None, pending_keys)
 
     if not spawn():
         print(term.clear + term.move_xy(0, 0) + "Game Over! (board too small)")
         return
 
-    last_fall = time.time()
+    next_fall = time.monotonic_ns() + fall_interval_ns
+    last_draw = 0
+    dirty = True  # set whenever the visible state changes
 
     with term.fullscreen(), term.cbreak(), term.hidden_cursor():
+        # Clear once; draw_board only overwrites from here on
+        write_out(term.home + term.clear)
         while True:
             # ------------------- Input -------------------
-            key = term.inkey(timeout=0.05)
+            # Sleep until the next fall (or the next allowed frame), not a fixed poll
+            wake = next_fall
+            if dirty:
+                wake = min(wake, last_draw + FRAME_INTERVAL_NS)
+            key = read_key(max(0, wake - time.monotonic_ns()) / 1e9, pending_keys)
 
-            if key.name == "KEY_LEFT":
+            if key == "KEY_LEFT":
                 new_pos = (pos[0] - 1, pos[1])
-                if can_place(board, shape, new_pos):
+                if can_place(row_bits, shape_bits, new_pos):
                     pos = new_pos
-            elif key.name == "KEY_RIGHT":
+                    dirty = True
+            elif key == "KEY_RIGHT":
                 new_pos = (pos[0] + 1, pos[1])
-                if can_place(board, shape, new_pos):
+                if can_place(row_bits, shape_bits, new_pos):
                     pos = new_pos
-            elif key.name == "KEY_DOWN":
+                    dirty = True
+            elif key == "KEY_DOWN":
                 new_pos = (pos[0], pos[1] + 1)
-                if can_place(board, shape, new_pos):
+                dirty = True
+                if can_place(row_bits, shape_bits, new_pos):
                     pos = new_pos
                 else:
                     # lock and spawn next
-                    lock_piece(board, shape, pos, piece)
-                    board, cleared = clear_full_lines(board)
-                    if cleared:
-                        total_cleared += cleared
-                        score += (cleared ** 2) * 100
-                        level = total_cleared // 10 + 1
-                        fall_interval = max(0.1, 0.5 - (level - 1) * 0.04)
-                    if not spawn():
-                        draw_board(term, board, None, None, None)
-                        print(
-                            term.move_xy(2, BOARD_HEIGHT + 3)
-                            + term.bold_red(f"Game Over! Final Score: {score}")
-                        )
-                        term.inkey()
+                    if not settle():
+                        game_over()
                         break
-            elif key.name == "KEY_UP" or key == "w":
+            elif key == "KEY_UP" or key == "w":
                 # rotate clockwise
                 next_rot = (rotation + 1) % len(TETROMINOS[piece])
                 next_shape = TETROMINOS[piece][next_rot]
-                if can_place(board, next_shape, pos):
+                next_bits = TETROMINOS_BITS[piece][next_rot]
+                if can_place(row_bits, next_bits, pos):
                     rotation = next_rot
                     shape = next_shape
+                    shape_bits = next_bits
+                    dirty = True
             elif key == " ":
                 # hard drop
-                while can_place(board, shape, (pos[0], pos[1] + 1)):
-                    pos = (pos[0], pos[1] + 1)
-                lock_piece(board, shape, pos, piece)
-                board, cleared = clear_full_lines(board)
-                if cleared:
-                    total_cleared += cleared
-                    score += (cleared ** 2) * 100
-                    level = total_cleared // 10 + 1
-                    fall_interval = max(0.1, 0.5 - (level - 1) * 0.04)
-                if not spawn():
-                    draw_board(term, board, None, None, None)
-                    print(
-                        term.move_xy(2, BOARD_HEIGHT + 3)
-                        + term.bold_red(f"Game Over! Final Score: {score}")
-                    )
-                    term.inkey()
+                dirty = True
+                pos = (pos[0], pos[1] + drop_distance(col_bits, shape, pos))
+                if not settle():
+                    game_over()
                     break
             elif key == "q":
                 break
 
             # ------------------- Automatic fall -------------------
-            now = time.time()
-            if now - last_fall >= fall_interval:
+            now = time.monotonic_ns()
+            if now >= next_fall:
+                dirty = True
                 new_pos = (pos[0], pos[1] + 1)
-                if can_place(board, shape, new_pos):
+                if can_place(row_bits, shape_bits, new_pos):
                     pos = new_pos
                 else:
-                    lock_piece(board, shape, pos, piece)
-                    board, cleared = clear_full_lines(board)
-                    if cleared:
-                        total_cleared += cleared
-                        score += (cleared ** 2) * 100
-                        level = total_cleared // 10 + 1
-                        fall_interval = max(0.1, 0.5 - (level - 1) * 0.04)
-                    if not spawn():
-                        draw_board(term, board, None, None, None)
-                        print(
-                            term.move_xy(2, BOARD_HEIGHT + 3)
-                            + term.bold_red(f"Game Over! Final Score: {score}")
-                        )
-                        term.inkey()
+                    if not settle():
+                        game_over()
                         break
-                last_fall = now
+                next_fall = now + fall_interval_ns
 
             # ------------------- Render -------------------
-            draw_board(term, board, shape, pos, piece)
-            print(
-                term.move_xy(2, BOARD_HEIGHT + 2)
-                + term.bold(f"Score: {score}  Level: {level}")
-            )
+            # Only redraw after a state change, and never faster than 60 FPS
+            if dirty and now - last_draw >= FRAME_INTERVAL_NS:
+                draw_board(term, frame, board, shape, pos, piece, score, level)
+                last_draw = now
+                dirty = False
 
 
 if __name__ == "__main__":